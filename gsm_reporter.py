@@ -1,21 +1,43 @@
 import sqlite3
-import requests
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib import font_manager
+from functools import lru_cache
 import io
 import base64
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+try:
+    import orjson
+    
+    def dumps_json(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    dumps_json = json.dumps
+
+class Game(NamedTuple):
+    """One row of the per-game breakdown"""
+    name: str
+    chars: int
+    lines: int
 
 class GSMReporter:
+    japanese_fonts = ['Yu Gothic', 'Hiragino Sans', 'Noto Sans CJK JP', 'MS Gothic', 'AppleGothic']
+    
     def __init__(self, db_path, webhook_url):
         self.db_path = db_path
         self.webhook_url = webhook_url
         self.state_file = "last_report_date.txt"
+        self.state_db_path = "gsm_report_state.db"
         self.timezone_offset = 9
+        self._conn = None
+        self._state_conn = None
+        self._now = None
+        self._streak_cache = None
+        self._total_lines = None
+        self._session = None
     
     def get_last_report_date(self):
         if os.path.exists(self.state_file):
@@ -27,52 +49,126 @@ class GSMReporter:
         with open(self.state_file, 'w') as f:
             f.write(date)
     
+    def connect_state_db(self):
+        """Return the connection to the reporter's own state database (sent reports)"""
+        if self._state_conn is None:
+            self._state_conn = sqlite3.connect(self.state_db_path, isolation_level=None)
+            self._state_conn.execute("""
+                CREATE TABLE IF NOT EXISTS report_log (
+                    date TEXT PRIMARY KEY,
+                    sent_at INTEGER
+                )
+            """)
+            self.import_legacy_report_files()
+        return self._state_conn
+    
+    def import_legacy_report_files(self):
+        """Move last_report_YYYY-MM-DD.txt markers from older versions into report_log"""
+        for path in Path('.').glob('last_report_????-??-??.txt'):
+            date_str = path.stem[len('last_report_'):]
+            self._state_conn.execute(
+                "INSERT OR IGNORE INTO report_log (date, sent_at) VALUES (?, ?)",
+                (date_str, int(path.stat().st_mtime))
+            )
+            path.unlink()
+    
+    def get_sent_report_dates(self, since):
+        """Return the set of report dates (YYYY-MM-DD) sent on or after `since`"""
+        cursor = self.connect_state_db().execute(
+            "SELECT date FROM report_log WHERE date >= ?", (since,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    def is_report_sent(self, date_str):
+        cursor = self.connect_state_db().execute(
+            "SELECT 1 FROM report_log WHERE date = ?", (date_str,)
+        )
+        return cursor.fetchone() is not None
+    
     def save_report_date_with_date(self, date_str):
         """Save report date for specific date"""
-        report_file = f"last_report_{date_str}.txt"
-        with open(report_file, 'w') as f:
-            f.write(datetime.now().isoformat())
+        self.connect_state_db().execute(
+            "INSERT OR REPLACE INTO report_log (date, sent_at) VALUES (?, ?)",
+            (date_str, int(datetime.now().timestamp()))
+        )
     
     def connect_db(self):
-        return sqlite3.connect(self.db_path)
+        """Return the shared connection, opening it on first use"""
+        if self._conn is not None:
+            return self._conn
+        
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_gl_ts ON game_lines(timestamp)")
+        except sqlite3.OperationalError:
+            # Read-only or locked database: queries still work, just without the index
+            pass
+        
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA query_only=1")
+        
+        self._conn = conn
+        return conn
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._state_conn is not None:
+            self._state_conn.close()
+            self._state_conn = None
+        self._now = None
+        self._streak_cache = None
+        self._total_lines = None
+    
+    def current_time(self):
+        """Reference time of the current report run (falls back to now)"""
+        return self._now or datetime.now()
+    
+    def day_bounds(self, days_ago=0):
+        """Return (start, end) Unix timestamps of a local day as integers.
+        
+        Only today's midnight goes through mktime; earlier days are whole
+        86400-second steps back from it.
+        """
+        now = self.current_time()
+        today_start = int(now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        day_start = today_start - 86400 * days_ago
+        return day_start, day_start + 86399
     
     def get_today_stats(self, days_ago=0):
         """Get statistics for specified date (0=today, 1=yesterday)"""
         conn = self.connect_db()
         cursor = conn.cursor()
         
-        now = datetime.now()
-        target_date = now - timedelta(days=days_ago)
-        day_start = datetime(target_date.year, target_date.month, target_date.day, 0, 0, 0)
-        day_end = datetime(target_date.year, target_date.month, target_date.day, 23, 59, 59)
-        
-        start_timestamp = day_start.timestamp()
-        end_timestamp = day_end.timestamp()
+        start_timestamp, end_timestamp = self.day_bounds(days_ago)
         
         stats = {}
         
         try:
             cursor.execute("""
-                SELECT COUNT(*) FROM game_lines 
-                WHERE timestamp >= ? AND timestamp <= ?
-            """, (start_timestamp, end_timestamp))
-            stats['lines_mined'] = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM game_lines 
-                WHERE timestamp >= ? AND timestamp <= ?
-                AND (screenshot_in_anki != '' OR audio_in_anki != '')
-            """, (start_timestamp, end_timestamp))
-            stats['anki_cards_created'] = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(DISTINCT game_name) FROM game_lines 
+                SELECT COUNT(*),
+                       SUM(CASE WHEN screenshot_in_anki != '' OR audio_in_anki != '' THEN 1 ELSE 0 END),
+                       COUNT(DISTINCT NULLIF(game_name, '')),
+                       SUM(CASE WHEN game_name != '' THEN LENGTH(line_text) ELSE 0 END),
+                       MIN(timestamp),
+                       MAX(timestamp)
+                FROM game_lines
                 WHERE timestamp >= ? AND timestamp <= ?
             """, (start_timestamp, end_timestamp))
-            stats['games_played'] = cursor.fetchone()[0]
+            lines_mined, anki_cards, games_played, total_chars, first_ts, last_ts = cursor.fetchone()
+            stats['lines_mined'] = lines_mined
+            stats['anki_cards_created'] = anki_cards or 0
+            stats['games_played'] = games_played
+            stats['total_chars'] = total_chars or 0
             
-            cursor.execute("SELECT COUNT(*) FROM game_lines")
-            stats['total_lines'] = cursor.fetchone()[0]
+            # Whole-table count: independent of the day, so count once per run
+            if self._total_lines is None:
+                cursor.execute("SELECT COUNT(*) FROM game_lines")
+                self._total_lines = cursor.fetchone()[0]
+            stats['total_lines'] = self._total_lines
             
             cursor.execute("""
                 SELECT game_name, 
@@ -83,32 +179,14 @@ class GSMReporter:
                 AND game_name IS NOT NULL AND game_name != ''
                 GROUP BY game_name
                 ORDER BY total_chars DESC
+                LIMIT 5
             """, (start_timestamp, end_timestamp))
             
-            games_data = []
-            total_chars = 0
-            for row in cursor.fetchall():
-                game_name, chars, lines = row
-                games_data.append({
-                    'name': game_name,
-                    'chars': chars,
-                    'lines': lines
-                })
-                total_chars += chars
-            
-            stats['games_list'] = games_data
-            stats['total_chars'] = total_chars
+            # Top 5 only; games_played carries the full count for the embed
+            stats['games_list'] = [Game._make(row) for row in cursor.fetchall()]
             
-            cursor.execute("""
-                SELECT MIN(timestamp), MAX(timestamp) 
-                FROM game_lines 
-                WHERE timestamp >= ? AND timestamp <= ?
-            """, (start_timestamp, end_timestamp))
-            
-            result = cursor.fetchone()
-            if result[0] and result[1]:
-                time_diff = result[1] - result[0]
-                stats['play_time_hours'] = time_diff / 3600
+            if first_ts and last_ts:
+                stats['play_time_hours'] = (last_ts - first_ts) / 3600
             else:
                 stats['play_time_hours'] = 0
             
@@ -124,109 +202,109 @@ class GSMReporter:
                 'play_time_hours': 0
             }
         
-        conn.close()
         return stats
     
     def get_activity_streak(self):
+        now = self.current_time()
+        if self._streak_cache and self._streak_cache[0] == now.date():
+            return self._streak_cache[1]
+        
         conn = self.connect_db()
         cursor = conn.cursor()
         
+        today_start = self.day_bounds(0)[0]
+        # Shift Unix time so that whole multiples of 86400 fall on local midnight
+        utc_offset = -today_start % 86400
+        today_index = (today_start + utc_offset) // 86400
+        
         try:
+            # Gaps-and-islands: consecutive days share day + row number, so the
+            # island holding the latest day is the current streak
             cursor.execute("""
-                SELECT DISTINCT DATE(timestamp, 'unixepoch', 'localtime') as activity_date
-                FROM game_lines
-                ORDER BY activity_date DESC
-            """)
+                WITH days AS (
+                    SELECT DISTINCT CAST((timestamp + ?) / 86400 AS INTEGER) AS day
+                    FROM game_lines
+                    WHERE timestamp < ?
+                ),
+                islands AS (
+                    SELECT day, day + ROW_NUMBER() OVER (ORDER BY day DESC) AS island
+                    FROM days
+                )
+                SELECT MAX(day), COUNT(*)
+                FROM islands
+                WHERE island = (SELECT MAX(day) + 1 FROM days)
+            """, (utc_offset, today_start + 86400))
             
-            dates = [row[0] for row in cursor.fetchall()]
-            
-            if not dates:
-                return 0
-            
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            if dates[0] != today and dates[0] != (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'):
-                return 0
-            
-            streak = 1
-            for i in range(len(dates) - 1):
-                current = datetime.strptime(dates[i], '%Y-%m-%d')
-                next_date = datetime.strptime(dates[i + 1], '%Y-%m-%d')
-                
-                if (current - next_date).days == 1:
-                    streak += 1
-                else:
-                    break
+            last_day, streak = cursor.fetchone()
+            if last_day is None or today_index - last_day > 1:
+                streak = 0
             
+            self._streak_cache = (now.date(), streak)
             return streak
             
         except sqlite3.OperationalError as e:
             print(f"Streak calculation error: {e}")
             return 0
-        finally:
-            conn.close()
     
-    def create_activity_heatmap_image(self, days=30):
+    def get_heatmap_data(self, days=30):
+        """Return (dates, char_counts) for the last N days, oldest first"""
         conn = self.connect_db()
         cursor = conn.cursor()
         
-        dates = []
-        char_counts = []
+        now = self.current_time()
+        dates = [now - timedelta(days=days_ago) for days_ago in range(days - 1, -1, -1)]
+        char_counts = [0] * days
         
-        for days_ago in range(days - 1, -1, -1):
-            date = datetime.now() - timedelta(days=days_ago)
-            day_start = datetime(date.year, date.month, date.day, 0, 0, 0)
-            day_end = datetime(date.year, date.month, date.day, 23, 59, 59)
-            
-            start_ts = day_start.timestamp()
-            end_ts = day_end.timestamp()
+        start_ts = self.day_bounds(days - 1)[0]
+        end_ts = self.day_bounds(0)[1]
+        
+        try:
+            cursor.execute("""
+                SELECT CAST((timestamp - ?) / 86400 AS INTEGER) AS day_index,
+                       SUM(LENGTH(line_text))
+                FROM game_lines
+                WHERE timestamp >= ? AND timestamp <= ?
+                GROUP BY day_index
+            """, (start_ts, start_ts, end_ts))
             
-            try:
-                cursor.execute("""
-                    SELECT SUM(LENGTH(line_text)) FROM game_lines 
-                    WHERE timestamp >= ? AND timestamp <= ?
-                """, (start_ts, end_ts))
-                
-                result = cursor.fetchone()[0]
-                char_count = result if result else 0
-                
-                dates.append(date)
-                char_counts.append(char_count)
-                
-            except sqlite3.OperationalError:
-                dates.append(date)
-                char_counts.append(0)
+            for day_index, char_count in cursor.fetchall():
+                if 0 <= day_index < days:
+                    char_counts[day_index] = char_count or 0
         
-        conn.close()
+        except sqlite3.OperationalError:
+            pass
+        
+        return dates, char_counts
+    
+    def render_heatmap(self, dates, char_counts):
+        """Draw the activity chart as PNG bytes; touches no pyplot state, so it can run in a worker thread"""
+        # matplotlib/numpy are imported on first draw: runs that never render skip their startup cost
+        import numpy as np
+        import matplotlib.dates as mdates
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
         
         try:
-            japanese_fonts = ['Yu Gothic', 'Hiragino Sans', 'Noto Sans CJK JP', 'MS Gothic', 'AppleGothic']
-            available_font = None
-            for font_name in japanese_fonts:
-                try:
-                    font_manager.findfont(font_name, fallback_to_default=False)
-                    available_font = font_name
-                    break
-                except:
-                    continue
-            
-            if available_font:
-                plt.rcParams['font.family'] = available_font
+            available_font = self.resolve_font()
         except:
-            pass
+            available_font = None
+        font = {'fontfamily': available_font} if available_font else {}
         
-        fig, ax = plt.subplots(figsize=(12, 4), facecolor='#2b2d31')
+        fig = Figure(figsize=(8, 2.5), dpi=80, facecolor='#2b2d31')
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         ax.set_facecolor('#2b2d31')
         
-        colors = ['#5865f2' if count > 0 else '#404249' for count in char_counts]
-        bars = ax.bar(dates, char_counts, color=colors, width=0.8, edgecolor='none')
+        counts = np.asarray(char_counts, dtype=np.int64)
+        colors = np.where(counts > 0, '#5865f2', '#404249').tolist()
+        bars = ax.bar(dates, counts, color=colors, width=0.8, edgecolor='none')
         
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=3))
         
-        ax.set_xlabel('Date', color='#b5bac1', fontsize=10)
-        ax.set_ylabel('Characters', color='#b5bac1', fontsize=10)
-        ax.set_title('Activity Heatmap - Past 30 Days', color='#ffffff', fontsize=14, pad=15)
+        ax.set_xlabel('Date', color='#b5bac1', fontsize=10, **font)
+        ax.set_ylabel('Characters', color='#b5bac1', fontsize=10, **font)
+        ax.set_title('Activity Heatmap - Past 30 Days', color='#ffffff', fontsize=14, pad=15, **font)
         
         ax.grid(True, alpha=0.1, color='#ffffff', linestyle='-', linewidth=0.5)
         ax.set_axisbelow(True)
@@ -237,18 +315,39 @@ class GSMReporter:
         ax.spines['right'].set_color('#404249')
         ax.tick_params(colors='#b5bac1', labelsize=8)
         
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        plt.tight_layout()
+        for label in ax.xaxis.get_majorticklabels():
+            label.set(rotation=45, ha='right', **font)
+        for label in ax.yaxis.get_majorticklabels():
+            label.set(**font)
+        fig.tight_layout()
         
         buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, facecolor='#2b2d31', edgecolor='none')
-        buf.seek(0)
-        plt.close()
+        # Small image + fast zlib level: PNG encoding dominates the cost of this chart
+        canvas.print_png(buf, pil_kwargs={'optimize': False, 'compress_level': 1})
         
-        return buf
+        return buf.getvalue()
+    
+    def create_activity_heatmap_image(self, days=30):
+        dates, char_counts = self.get_heatmap_data(days)
+        return self.render_heatmap(dates, char_counts)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def resolve_font(cls):
+        """Find the first installed Japanese font (looked up once per process)"""
+        from matplotlib import font_manager
+        
+        for font_name in cls.japanese_fonts:
+            try:
+                font_manager.findfont(font_name, fallback_to_default=False)
+                return font_name
+            except:
+                continue
+        return None
     
     def format_report(self, stats, streak, days_ago=0):
-        target_date = datetime.now() - timedelta(days=days_ago)
+        now = self.current_time()
+        target_date = now - timedelta(days=days_ago)
         date_str = target_date.strftime('%B %d, %Y')
         weekday = target_date.strftime('%A')
         
@@ -292,28 +391,56 @@ class GSMReporter:
             "footer": {
                 "text": "GameSentenceMiner Auto Report"
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
         
         if stats['games_list']:
-            games_text = ""
-            for i, game in enumerate(stats['games_list'][:5], 1):
-                games_text += f"{i}. **{game['name']}**\n"
-                games_text += f"   └ {game['lines']} lines / {game['chars']:,} chars\n"
+            games_parts = [
+                f"{i}. **{game.name}**\n   └ {game.lines} lines / {game.chars:,} chars\n"
+                for i, game in enumerate(stats['games_list'], 1)
+            ]
             
-            if len(stats['games_list']) > 5:
-                remaining = len(stats['games_list']) - 5
-                games_text += f"\n...and {remaining} more"
+            if stats['games_played'] > len(stats['games_list']):
+                remaining = stats['games_played'] - len(stats['games_list'])
+                games_parts.append(f"\n...and {remaining} more")
             
             embed["fields"].append({
                 "name": "🎮 Today's Games",
-                "value": games_text,
+                "value": "".join(games_parts),
                 "inline": False
             })
         
         return embed
     
+    def get_session(self):
+        """Return the webhook HTTP session, creating it on first use"""
+        if self._session is None:
+            # Imported here so --debug and skipped runs never load requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            session.headers['User-Agent'] = 'gsm-auto-report'
+            # Resend only when Discord cannot have posted the message yet: on a 429
+            # (honouring Retry-After) or a failed connect. After a 5xx or a read
+            # timeout it may already be in the channel, so that is reported instead;
+            # the last response is returned (not raised) for send_to_discord to print
+            retry = Retry(
+                total=3,
+                read=0,
+                backoff_factor=1,
+                status_forcelist=(429,),
+                allowed_methods=frozenset(['POST']),
+                raise_on_status=False
+            )
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+            self._session = session
+        return self._session
+    
     def send_to_discord(self, embed, heatmap_image):
+        # heatmap_image is the PNG as bytes; requests sends it as-is, so the
+        # same bytes can be posted any number of times
         files = {
             'file': ('heatmap.png', heatmap_image, 'image/png')
         }
@@ -325,11 +452,14 @@ class GSMReporter:
         }
         
         data = {
-            'payload_json': json.dumps(payload)
+            'payload_json': dumps_json(payload)
         }
         
+        # requests is loaded lazily with the session, so its exception type is too
+        from requests.exceptions import RequestException
+        
         try:
-            response = requests.post(
+            response = self.get_session().post(
                 self.webhook_url,
                 data=data,
                 files=files,
@@ -344,7 +474,7 @@ class GSMReporter:
                 print(response.text)
                 return False
                 
-        except requests.exceptions.RequestException as e:
+        except RequestException as e:
             print(f"❌ Send error: {e}")
             return False
     
@@ -353,17 +483,28 @@ class GSMReporter:
         print("🔍 Checking for missing reports...")
         
         reports_sent = []
-        today = datetime.now()
+        today = self.current_time()
+        heatmap_image = None
+        
+        oldest_date = (today - timedelta(days=max_days_back)).strftime('%Y-%m-%d')
+        sent_dates = self.get_sent_report_dates(oldest_date)
+        
+        # Per-day character totals from one grouped query: used both to skip
+        # empty days before building their stats and to draw the heatmap
+        dates, char_counts = self.get_heatmap_data(days=max(30, max_days_back + 1))
         
         for days_ago in range(1, max_days_back + 1):
             target_date = today - timedelta(days=days_ago)
             date_str = target_date.strftime('%Y-%m-%d')
-            report_file = f"last_report_{date_str}.txt"
             
-            if os.path.exists(report_file):
+            if date_str in sent_dates:
                 print(f"  ✅ {date_str}: Already sent")
                 continue
             
+            if char_counts[-1 - days_ago] == 0:
+                print(f"  ⚪ {date_str}: No data (skipped)")
+                continue
+            
             stats = self.get_today_stats(days_ago=days_ago)
             
             if stats['total_chars'] == 0:
@@ -374,12 +515,14 @@ class GSMReporter:
             
             try:
                 streak = self.get_activity_streak()
-                heatmap_image = self.create_activity_heatmap_image()
+                if heatmap_image is None:
+                    # The heatmap does not depend on days_ago: render it once per backfill
+                    heatmap_image = self.render_heatmap(dates[-30:], char_counts[-30:])
                 embed = self.format_report(stats, streak, days_ago=days_ago)
                 
+                # Posted one at a time so the reports land in the channel in day order
                 if self.send_to_discord(embed, heatmap_image):
-                    with open(report_file, 'w') as f:
-                        f.write(datetime.now().isoformat())
+                    self.save_report_date_with_date(date_str)
                     reports_sent.append(date_str)
                     print(f"  ✅ {date_str}: Sent!")
                     
@@ -395,46 +538,52 @@ class GSMReporter:
     
     def generate_and_send_report(self, force=False, days_ago=0, check_missing=False):
         """Generate and send report"""
-        if check_missing:
-            self.check_and_send_missing_reports(max_days_back=7)
-            return
-        
-        target_date = datetime.now() - timedelta(days=days_ago)
-        date_str = target_date.strftime('%Y-%m-%d')
-        report_file = f"last_report_{date_str}.txt"
-        
-        if not force and os.path.exists(report_file):
-            print(f"ℹ️  Report for {date_str} already sent")
-            return
-        
-        print(f"📊 Generating report for {date_str}...")
-        stats = self.get_today_stats(days_ago=days_ago)
-        
-        if stats['total_chars'] == 0:
-            print(f"ℹ️  No data for {date_str}, skipping...")
-            return
-        
-        streak = self.get_activity_streak()
-        
-        print("📈 Creating heatmap image...")
-        heatmap_image = self.create_activity_heatmap_image()
-        
-        embed = self.format_report(stats, streak, days_ago=days_ago)
-        
-        if self.send_to_discord(embed, heatmap_image):
-            self.save_report_date_with_date(date_str)
-            print("✅ Report sent successfully!")
-            print(f"   - Date: {date_str}")
-            print(f"   - Play time: {stats['play_time_hours']:.1f} hours")
-            print(f"   - Characters: {stats['total_chars']:,}")
-            print(f"   - Streak: {streak} days")
+        self._now = datetime.now()
+        try:
+            if check_missing:
+                self.check_and_send_missing_reports(max_days_back=7)
+                return
+            
+            target_date = self._now - timedelta(days=days_ago)
+            date_str = target_date.strftime('%Y-%m-%d')
+            
+            if not force and self.is_report_sent(date_str):
+                print(f"ℹ️  Report for {date_str} already sent")
+                return
+            
+            print(f"📊 Generating report for {date_str}...")
+            stats = self.get_today_stats(days_ago=days_ago)
+            
+            if stats['total_chars'] == 0:
+                print(f"ℹ️  No data for {date_str}, skipping...")
+                return
+            
+            dates, char_counts = self.get_heatmap_data()
+            
+            # Render the chart in the background while the streak is queried
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                heatmap_future = executor.submit(self.render_heatmap, dates, char_counts)
+                streak = self.get_activity_streak()
+                embed = self.format_report(stats, streak, days_ago=days_ago)
+                
+                print("📈 Creating heatmap image...")
+                heatmap_image = heatmap_future.result()
+            
+            if self.send_to_discord(embed, heatmap_image):
+                self.save_report_date_with_date(date_str)
+                print("✅ Report sent successfully!")
+                print(f"   - Date: {date_str}")
+                print(f"   - Play time: {stats['play_time_hours']:.1f} hours")
+                print(f"   - Characters: {stats['total_chars']:,}")
+                print(f"   - Streak: {streak} days")
+        finally:
+            self.close()
     
     def list_tables(self):
         conn = self.connect_db()
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = cursor.fetchall()
-        conn.close()
         
         print("\n📋 Database tables:")
         for table in tables:
@@ -460,8 +609,6 @@ class GSMReporter:
                 print(f"  {dt.strftime('%Y-%m-%d %H:%M')} | {row[1]} | {row[2][:30]}...")
         except sqlite3.OperationalError as e:
             print(f"  Error: {e}")
-        
-        conn.close()
 
 
 def find_gsm_db():